@@ -10,16 +10,11 @@ and comprehensive reporting for AI risk assessment data.
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.cluster import KMeans
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import orjson
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -32,6 +27,8 @@ class AdvancedRiskAnalyzer:
         self.analysis_results = {}
         self.models = {}
         self.scalers = {}
+        self._codes = {}
+        self._lock = threading.Lock()
         
     def load_data(self, data_source='generated'):
         """Load data from various sources"""
@@ -42,7 +39,7 @@ class AdvancedRiskAnalyzer:
     
     def _generate_comprehensive_dataset(self):
         """Generate comprehensive dataset for analysis"""
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         
         # Comprehensive data generation
         sectors = ['Education', 'Healthcare', 'Business', 'Technology', 'Government']
@@ -60,33 +57,49 @@ class AdvancedRiskAnalyzer:
         ]
         
         severity_levels = ['Low', 'Medium', 'High', 'Critical']
+        regions = ['North America', 'Europe', 'Asia', 'Other']
+        organization_sizes = ['Small', 'Medium', 'Large', 'Enterprise']
         
         n_records = 1500
         
+        # Fixed-vocabulary columns are stored as categoricals so grouping and
+        # comparisons work on small integer codes instead of Python strings
         data = {
-            'sector': np.random.choice(sectors, n_records),
-            'ai_tool': np.random.choice(ai_tools, n_records),
-            'risk_type': np.random.choice(risk_types, n_records),
-            'severity': np.random.choice(severity_levels, n_records, p=[0.15, 0.35, 0.35, 0.15]),
-            'impact_score': np.random.uniform(1, 10, n_records),
-            'frequency_percentage': np.random.uniform(5, 95, n_records),
-            'mitigation_cost': np.random.lognormal(8, 1, n_records),
-            'implementation_time': np.random.gamma(2, 5, n_records),
-            'effectiveness_score': np.random.uniform(3, 10, n_records),
-            'user_satisfaction': np.random.uniform(1, 10, n_records),
-            'regulatory_compliance': np.random.choice([0, 1], n_records, p=[0.3, 0.7]),
-            'geographic_region': np.random.choice(['North America', 'Europe', 'Asia', 'Other'], n_records),
-            'organization_size': np.random.choice(['Small', 'Medium', 'Large', 'Enterprise'], n_records),
-            'report_date': pd.date_range('2023-01-01', periods=n_records, freq='4H')
+            'sector': pd.Categorical(rng.choice(sectors, n_records), categories=sectors),
+            'ai_tool': pd.Categorical(rng.choice(ai_tools, n_records), categories=ai_tools),
+            'risk_type': pd.Categorical(rng.choice(risk_types, n_records), categories=risk_types),
+            'severity': pd.Categorical(rng.choice(severity_levels, n_records, p=[0.15, 0.35, 0.35, 0.15]),
+                                       categories=severity_levels, ordered=True),
+            'impact_score': rng.uniform(1, 10, n_records),
+            'frequency_percentage': rng.uniform(5, 95, n_records),
+            'mitigation_cost': rng.lognormal(8, 1, n_records),
+            'implementation_time': rng.gamma(2, 5, n_records),
+            'effectiveness_score': rng.uniform(3, 10, n_records),
+            'user_satisfaction': rng.uniform(1, 10, n_records),
+            'regulatory_compliance': rng.choice([0, 1], n_records, p=[0.3, 0.7]),
+            'geographic_region': pd.Categorical(rng.choice(regions, n_records), categories=regions),
+            'organization_size': pd.Categorical(rng.choice(organization_sizes, n_records),
+                                                categories=organization_sizes),
+            'report_date': np.datetime64('2023-01-01') + np.arange(n_records) * np.timedelta64(4, 'h')
         }
         
+        # Add derived features in one pass over the raw column arrays so the
+        # frame is built in one go instead of growing column by column.
+        # Urgency buckets match pd.cut(bins=[0, 2, 4, 6, 10]): right-closed.
+        risk_score = np.round(data['impact_score'] * data['frequency_percentage'] / 100, 2)
+        data['risk_score'] = risk_score
+        data['cost_effectiveness'] = np.round(data['effectiveness_score'] / (data['mitigation_cost'] / 1000), 2)
+        data['urgency_level'] = pd.Categorical.from_codes(
+            np.digitize(risk_score, [2, 4, 6], right=True),
+            categories=['Low', 'Medium', 'High', 'Critical'], ordered=True
+        )
+
         df = pd.DataFrame(data)
-        
-        # Add derived features
-        df['risk_score'] = (df['impact_score'] * df['frequency_percentage'] / 100).round(2)
-        df['cost_effectiveness'] = (df['effectiveness_score'] / (df['mitigation_cost'] / 1000)).round(2)
-        df['urgency_level'] = pd.cut(df['risk_score'], bins=[0, 2, 4, 6, 10], 
-                                   labels=['Low', 'Medium', 'High', 'Critical'])
+        df.attrs['numeric_cols'] = [
+            'impact_score', 'frequency_percentage', 'mitigation_cost', 'implementation_time',
+            'effectiveness_score', 'user_satisfaction', 'regulatory_compliance',
+            'risk_score', 'cost_effectiveness'
+        ]
         
         return df
     
@@ -94,26 +107,23 @@ class AdvancedRiskAnalyzer:
         """Perform comprehensive statistical analysis"""
         print("🔍 Performing comprehensive risk analysis...")
         
-        # 1. Descriptive Statistics
-        self.analysis_results['descriptive_stats'] = self._descriptive_analysis(df)
-        
-        # 2. Sector Analysis
-        self.analysis_results['sector_analysis'] = self._sector_analysis(df)
-        
-        # 3. Risk Pattern Analysis
-        self.analysis_results['risk_patterns'] = self._risk_pattern_analysis(df)
-        
-        # 4. Correlation Analysis
-        self.analysis_results['correlations'] = self._correlation_analysis(df)
-        
-        # 5. Clustering Analysis
-        self.analysis_results['clusters'] = self._clustering_analysis(df)
-        
-        # 6. Predictive Modeling
-        self.analysis_results['prediction_model'] = self._build_prediction_model(df)
-        
-        # 7. Trend Analysis
-        self.analysis_results['trends'] = self._trend_analysis(df)
+        # Encode the shared grouping columns once for all analyses
+        self._codes = {col: self._encode(df[col]) for col in ['sector', 'risk_type', 'severity', 'ai_tool']}
+        
+        # The analyses only read df, so they run concurrently; NumPy, pandas
+        # and sklearn release the GIL for most of their work
+        analyses = [
+            ('descriptive_stats', self._descriptive_analysis),    # 1. Descriptive Statistics
+            ('sector_analysis', self._sector_analysis),           # 2. Sector Analysis
+            ('risk_patterns', self._risk_pattern_analysis),       # 3. Risk Pattern Analysis
+            ('correlations', self._correlation_analysis),         # 4. Correlation Analysis
+            ('clusters', self._clustering_analysis),              # 5. Clustering Analysis
+            ('prediction_model', self._build_prediction_model),   # 6. Predictive Modeling
+            ('trends', self._trend_analysis)                      # 7. Trend Analysis
+        ]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [(key, executor.submit(analysis, df)) for key, analysis in analyses]
+            self.analysis_results.update((key, future.result()) for key, future in futures)
         
         return self.analysis_results
     
@@ -121,33 +131,54 @@ class AdvancedRiskAnalyzer:
         """Comprehensive descriptive statistics"""
         print("📊 Calculating descriptive statistics...")
         
+        # Counts come from the shared codes; the two means share one column pass
+        means = df[['impact_score', 'risk_score']].mean()
+        high_risk = np.isin(df['urgency_level'].to_numpy(), ['High', 'Critical'])
+        
         stats = {
             'total_records': len(df),
-            'unique_ai_tools': df['ai_tool'].nunique(),
-            'unique_risk_types': df['risk_type'].nunique(),
-            'severity_distribution': df['severity'].value_counts().to_dict(),
-            'sector_distribution': df['sector'].value_counts().to_dict(),
-            'average_impact_score': df['impact_score'].mean(),
-            'average_risk_score': df['risk_score'].mean(),
-            'high_risk_percentage': (df['urgency_level'].isin(['High', 'Critical']).sum() / len(df) * 100)
+            'unique_ai_tools': len(self._codes['ai_tool'][1]),
+            'unique_risk_types': len(self._codes['risk_type'][1]),
+            'severity_distribution': self._distribution('severity'),
+            'sector_distribution': self._distribution('sector'),
+            'average_impact_score': means['impact_score'],
+            'average_risk_score': means['risk_score'],
+            'high_risk_percentage': (high_risk.sum() / len(df) * 100)
         }
         
         return stats
     
+    def _distribution(self, col):
+        """Value counts of a shared encoded column, most frequent first"""
+        codes, labels = self._codes[col]
+        counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+        return {labels[i]: int(counts[i]) for i in np.argsort(-counts, kind='stable')}
+    
     def _sector_analysis(self, df):
         """Analyze risks by sector"""
         print("🏢 Analyzing sector-specific risks...")
         
-        sector_stats = df.groupby('sector').agg({
-            'risk_score': ['mean', 'std', 'max'],
-            'impact_score': 'mean',
-            'frequency_percentage': 'mean',
-            'mitigation_cost': 'mean',
-            'effectiveness_score': 'mean'
-        }).round(2)
-        
-        # Flatten column names
-        sector_stats.columns = ['_'.join(col).strip() for col in sector_stats.columns]
+        sector_idx, sector_labels = self._codes['sector']
+        n_sectors = len(sector_labels)
+        mean_cols = ['risk_score', 'impact_score', 'frequency_percentage', 'mitigation_cost', 'effectiveness_score']
+        means, counts = self._group_means(sector_idx, n_sectors, df[mean_cols].to_numpy(dtype=float))
+        
+        # Sample standard deviation and maximum of risk_score per sector
+        risk = df['risk_score'].to_numpy(dtype=float)
+        known = (sector_idx >= 0) & ~np.isnan(risk)
+        deviations = risk[known] - means[sector_idx[known], 0]
+        risk_max = np.full(n_sectors, np.nan)
+        np.fmax.at(risk_max, sector_idx[known], risk[known])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            risk_std = np.sqrt(np.bincount(sector_idx[known], deviations ** 2, minlength=n_sectors)
+                               / (counts[:, 0] - 1))
+        
+        sector_stats = pd.DataFrame({
+            'risk_score_mean': means[:, 0],
+            'risk_score_std': risk_std,
+            'risk_score_max': risk_max,
+            **{f'{col}_mean': means[:, i] for i, col in enumerate(mean_cols) if i > 0}
+        }, index=sector_labels).round(2)
         
         return sector_stats.to_dict()
     
@@ -157,17 +188,36 @@ class AdvancedRiskAnalyzer:
         
         patterns = {}
         
-        # Risk type vs Severity
-        risk_severity = pd.crosstab(df['risk_type'], df['severity'], normalize='index') * 100
+        # Risk type vs Severity (row percentages)
+        risk_idx, risk_labels = self._codes['risk_type']
+        severity_idx, severity_labels = self._codes['severity']
+        sector_idx, sector_labels = self._codes['sector']
+        counts = self._contingency(risk_idx, severity_idx, (len(risk_labels), len(severity_labels)))
+        risk_severity = pd.DataFrame(counts / counts.sum(axis=1, keepdims=True) * 100,
+                                     index=risk_labels, columns=severity_labels)
         patterns['risk_severity_matrix'] = risk_severity.to_dict()
         
         # Top risk combinations
-        risk_combos = df.groupby(['sector', 'risk_type']).size().sort_values(ascending=False).head(10)
-        patterns['top_risk_combinations'] = risk_combos.to_dict()
+        combo_counts = self._contingency(sector_idx, risk_idx, (len(sector_labels), len(risk_labels))).ravel()
+        top = np.argsort(-combo_counts, kind='stable')[:10]
+        top = top[combo_counts[top] > 0]
+        patterns['top_risk_combinations'] = {
+            (sector_labels[i // len(risk_labels)], risk_labels[i % len(risk_labels)]): int(combo_counts[i])
+            for i in top
+        }
         
-        # Critical risks by sector
-        critical_risks = df[df['severity'] == 'Critical'].groupby('sector')['risk_type'].value_counts()
-        patterns['critical_risks_by_sector'] = critical_risks.to_dict()
+        # Critical risks by sector: count (sector, risk_type) code pairs packed
+        # into one integer, ordered by sector then by descending count
+        critical_code = severity_labels.get_indexer(['Critical'])[0]
+        critical = (critical_code >= 0) & (severity_idx == critical_code) & (sector_idx >= 0) & (risk_idx >= 0)
+        packed = (sector_idx[critical].astype(np.uint32) << 16) | risk_idx[critical].astype(np.uint32)
+        pair_keys, pair_counts = np.unique(packed, return_counts=True)
+        pair_sectors, pair_risks = pair_keys >> 16, pair_keys & 0xFFFF
+        order = np.lexsort((-pair_counts, pair_sectors))
+        patterns['critical_risks_by_sector'] = {
+            (sector_labels[pair_sectors[i]], risk_labels[pair_risks[i]]): int(pair_counts[i])
+            for i in order
+        }
         
         return patterns
     
@@ -175,20 +225,31 @@ class AdvancedRiskAnalyzer:
         """Analyze correlations between numerical variables"""
         print("📈 Analyzing correlations...")
         
-        numerical_cols = df.select_dtypes(include=[np.number]).columns
-        correlation_matrix = df[numerical_cols].corr()
-        
-        # Find strong correlations
-        strong_correlations = []
-        for i in range(len(correlation_matrix.columns)):
-            for j in range(i+1, len(correlation_matrix.columns)):
-                corr_value = correlation_matrix.iloc[i, j]
-                if abs(corr_value) > 0.5:
-                    strong_correlations.append({
-                        'variable1': correlation_matrix.columns[i],
-                        'variable2': correlation_matrix.columns[j],
-                        'correlation': corr_value
-                    })
+        numerical_cols = df.attrs.get('numeric_cols')
+        if numerical_cols is None:
+            numerical_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        
+        # np.corrcoef is not NaN-aware; fall back to pandas' pairwise version
+        values = df[numerical_cols].to_numpy(dtype=float)
+        if np.isnan(values).any():
+            correlation_matrix = df[numerical_cols].corr()
+        else:
+            correlation_matrix = pd.DataFrame(np.corrcoef(values, rowvar=False),
+                                              index=numerical_cols, columns=numerical_cols)
+        
+        # Find strong correlations in the upper triangle (matrix is symmetric)
+        corr_values = correlation_matrix.to_numpy()
+        upper_i, upper_j = np.triu_indices(corr_values.shape[0], k=1)
+        upper_values = corr_values[upper_i, upper_j]
+        strong = np.abs(upper_values) > 0.5
+
+        columns = correlation_matrix.columns
+        strong_correlations = [
+            {'variable1': var1, 'variable2': var2, 'correlation': corr_value}
+            for var1, var2, corr_value in zip(columns[upper_i[strong]],
+                                              columns[upper_j[strong]],
+                                              upper_values[strong])
+        ]
         
         return {
             'correlation_matrix': correlation_matrix.to_dict(),
@@ -197,32 +258,31 @@ class AdvancedRiskAnalyzer:
     
     def _clustering_analysis(self, df):
         """Perform clustering analysis to identify risk profiles"""
+        from sklearn.cluster import MiniBatchKMeans
+        
         print("🎯 Performing clustering analysis...")
         
         # Prepare data for clustering
         features = ['impact_score', 'frequency_percentage', 'mitigation_cost', 'effectiveness_score']
-        X = df[features].fillna(df[features].mean())
-        
+        X = self._feature_matrix(df, features)
+
         # Standardize features
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-        self.scalers['clustering'] = scaler
-        
-        # Perform K-means clustering
-        kmeans = KMeans(n_clusters=4, random_state=42)
+        mu = X.mean(axis=0)
+        sd = X.std(axis=0)
+        X_scaled = (X - mu) / sd
+        with self._lock:
+            self.scalers['clustering'] = (mu, sd)
+
+        # Perform mini-batch K-means clustering
+        kmeans = MiniBatchKMeans(n_clusters=4, random_state=42, batch_size=256,
+                                 n_init=3, max_iter=100)
         clusters = kmeans.fit_predict(X_scaled)
-        
-        df_cluster = df.copy()
-        df_cluster['cluster'] = clusters
-        
+
         # Analyze clusters
-        cluster_analysis = df_cluster.groupby('cluster').agg({
-            'impact_score': 'mean',
-            'frequency_percentage': 'mean',
-            'mitigation_cost': 'mean',
-            'effectiveness_score': 'mean',
-            'risk_score': 'mean'
-        }).round(2)
+        profile_cols = features + ['risk_score']
+        cluster_ids, cluster_means = self._sorted_group_means(clusters, df[profile_cols].to_numpy(dtype=float))
+        cluster_analysis = pd.DataFrame(cluster_means, index=cluster_ids,
+                                        columns=profile_cols).round(2)
         
         # Label clusters
         cluster_labels = {
@@ -235,64 +295,129 @@ class AdvancedRiskAnalyzer:
         return {
             'cluster_centers': cluster_analysis.to_dict(),
             'cluster_labels': cluster_labels,
-            'cluster_distribution': pd.Series(clusters).value_counts().to_dict()
+            'cluster_distribution': dict(enumerate(np.bincount(clusters, minlength=4).tolist()))
         }
     
     def _build_prediction_model(self, df):
         """Build predictive model for risk severity"""
+        from sklearn.ensemble import HistGradientBoostingClassifier
+        from sklearn.inspection import permutation_importance
+        from sklearn.model_selection import train_test_split
+        
         print("🤖 Building predictive model...")
         
         # Prepare features
         features = ['impact_score', 'frequency_percentage', 'mitigation_cost', 'effectiveness_score']
-        X = df[features].fillna(df[features].mean())
+        X = self._feature_matrix(df, features)
         
-        # Encode target variable
-        le = LabelEncoder()
-        y = le.fit_transform(df['severity'])
+        # Target variable: the shared severity codes
+        y = self._codes['severity'][0]
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
         # Train model
-        rf_model = RandomForestClassifier(n_estimators=100, random_state=42)
-        rf_model.fit(X_train, y_train)
+        gb_model = HistGradientBoostingClassifier(max_iter=100, max_bins=64, random_state=42)
+        gb_model.fit(X_train, y_train)
         
         # Evaluate model
-        y_pred = rf_model.predict(X_test)
-        accuracy = rf_model.score(X_test, y_test)
+        accuracy = gb_model.score(X_test, y_test)
         
-        # Feature importance
-        feature_importance = dict(zip(features, rf_model.feature_importances_))
+        # Feature importance (histogram boosting has no impurity importances)
+        importance = permutation_importance(gb_model, X_test, y_test, n_repeats=3, random_state=42)
+        feature_importance = dict(zip(features, importance.importances_mean))
         
-        self.models['severity_predictor'] = rf_model
+        with self._lock:
+            self.models['severity_predictor'] = gb_model
         
         return {
             'accuracy': accuracy,
             'feature_importance': feature_importance,
-            'model_type': 'Random Forest',
-            'n_estimators': 100
+            'model_type': 'Histogram Gradient Boosting',
+            'max_iter': 100
         }
     
     def _trend_analysis(self, df):
         """Analyze trends over time"""
         print("📅 Analyzing trends...")
         
-        # Monthly trends
-        df['month'] = df['report_date'].dt.to_period('M')
-        monthly_trends = df.groupby('month').agg({
-            'risk_score': 'mean',
-            'impact_score': 'mean',
-            'frequency_percentage': 'mean'
-        }).round(2)
-        
-        # Severity trends
-        severity_trends = df.groupby(['month', 'severity']).size().unstack(fill_value=0)
+        # Monthly trends, keyed on an integer month code (months since epoch)
+        # so the caller's frame is left untouched
+        month_code = df['report_date'].to_numpy().astype('datetime64[M]').astype(np.int64)
+        trend_cols = ['risk_score', 'impact_score', 'frequency_percentage']
+        month_labels, month_means = self._sorted_group_means(month_code, df[trend_cols].to_numpy(dtype=float))
+        monthly_trends = pd.DataFrame(month_means, index=self._month_periods(month_labels),
+                                      columns=trend_cols).round(2)
+        
+        # Severity trends: month x severity tally over integer codes
+        month_idx = np.searchsorted(month_labels, month_code)
+        severity_idx, severity_labels = self._codes['severity']
+        severity_counts = self._contingency(month_idx, severity_idx,
+                                            (len(month_labels), len(severity_labels)))
+        severity_trends = pd.DataFrame(severity_counts,
+                                       index=self._month_periods(month_labels),
+                                       columns=severity_labels)
         
         return {
             'monthly_trends': monthly_trends.to_dict(),
             'severity_trends': severity_trends.to_dict()
         }
     
+    @staticmethod
+    def _feature_matrix(df, features):
+        """float32 model inputs with missing values filled by their column mean"""
+        X = df[features].to_numpy(dtype=np.float32)
+        missing = np.isnan(X)
+        if missing.any():
+            X[missing] = np.nanmean(X, axis=0)[np.nonzero(missing)[1]]
+        return X
+    
+    @staticmethod
+    def _encode(series):
+        """Integer codes and labels for a grouping column (-1 marks missing)"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.cat.remove_unused_categories()
+            return series.cat.codes.to_numpy(), series.cat.categories
+        return pd.factorize(series, sort=True)
+    
+    @staticmethod
+    def _group_means(codes, n_groups, values):
+        """Per-group column means and non-missing counts, skipping NaNs like pandas"""
+        known = codes >= 0
+        codes, values = codes[known], values[known]
+        present = ~np.isnan(values)
+        sums = np.zeros((n_groups, values.shape[1]))
+        counts = np.zeros((n_groups, values.shape[1]), dtype=np.int64)
+        np.add.at(sums, codes, np.where(present, values, 0.0))
+        np.add.at(counts, codes, present)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sums / counts, counts
+    
+    @staticmethod
+    def _sorted_group_means(keys, values):
+        """Sorted unique keys and per-key column means via one reduceat over key-sorted rows"""
+        order = np.argsort(keys, kind='stable')
+        group_keys, starts = np.unique(keys[order], return_index=True)
+        values = values[order]
+        present = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(present, values, 0.0), starts, axis=0)
+        counts = np.add.reduceat(present, starts, axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return group_keys, sums / counts
+    
+    @staticmethod
+    def _contingency(row_idx, col_idx, shape):
+        """Count (row, column) code pairs, skipping missing (-1) codes"""
+        counts = np.zeros(shape, dtype=np.int64)
+        known = (row_idx >= 0) & (col_idx >= 0)
+        np.add.at(counts, (row_idx[known], col_idx[known]), 1)
+        return counts
+    
+    @staticmethod
+    def _month_periods(month_codes):
+        """Convert integer month codes back to monthly periods for reporting"""
+        return pd.PeriodIndex(np.asarray(month_codes).astype('datetime64[M]'), freq='M')
+    
     def generate_comprehensive_report(self):
         """Generate comprehensive analysis report"""
         print("\n" + "="*60)
@@ -328,6 +453,8 @@ class AdvancedRiskAnalyzer:
     
     def create_interactive_visualizations(self, df):
         """Create interactive visualizations using Plotly"""
+        import plotly.express as px
+        
         print("📊 Creating interactive visualizations...")
         
         # Risk Score Distribution by Sector
@@ -341,7 +468,7 @@ class AdvancedRiskAnalyzer:
                          title='Risk Impact vs Frequency Analysis')
         
         # Sector Comparison
-        sector_summary = df.groupby('sector').agg({
+        sector_summary = df.groupby('sector', observed=True).agg({
             'risk_score': 'mean',
             'impact_score': 'mean',
             'effectiveness_score': 'mean'
@@ -352,15 +479,36 @@ class AdvancedRiskAnalyzer:
         
         return [fig1, fig2, fig3]
     
+    @classmethod
+    def _json_ready(cls, obj):
+        """Recursively convert dict keys orjson cannot serialize (tuples, periods, numpy scalars)"""
+        if isinstance(obj, dict):
+            return {cls._json_key(key): cls._json_ready(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [cls._json_ready(value) for value in obj]
+        return obj
+    
+    @staticmethod
+    def _json_key(key):
+        """Map a dict key onto a type orjson accepts as an object key"""
+        if isinstance(key, np.generic):
+            return key.item()
+        if key is None or isinstance(key, (str, int, float, bool)):
+            return key
+        return str(key)
+    
     def export_analysis_results(self, format='json'):
         """Export analysis results"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"ai_risk_analysis_results_{timestamp}"
         
         if format == 'json':
-            import json
-            with open(f"{filename}.json", 'w') as f:
-                json.dump(self.analysis_results, f, indent=2, default=str)
+            payload = orjson.dumps(
+                self._json_ready(self.analysis_results),
+                default=str,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+            Path(f"{filename}.json").write_bytes(payload)
         
         print(f"✅ Analysis results exported to {filename}.{format}")
         return f"{filename}.{format}"
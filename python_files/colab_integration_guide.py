@@ -30,16 +30,25 @@ def install_packages():
         'psycopg2-binary',
         'python-dotenv',
         'openpyxl',
+        'pyarrow',
+        'xlsxwriter',
         'kaleido'  # for plotly static image export
     ]
     
     print("🔧 Installing required packages...")
-    for package in packages:
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-            print(f"✅ {package} installed successfully")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install {package}: {e}")
+    try:
+        # A single pip run resolves the whole set in one pass
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "--no-input", *packages])
+    except subprocess.CalledProcessError:
+        # Fall back to one package at a time to isolate the failing one
+        print("⚠️ Batch install failed, retrying packages individually...")
+        for package in packages:
+            try:
+                subprocess.check_call([sys.executable, "-m", "pip", "install", "--no-input", package])
+                print(f"✅ {package} installed successfully")
+            except subprocess.CalledProcessError as e:
+                print(f"❌ Failed to install {package}: {e}")
+        return
     
     print("\n🎉 All packages installed successfully!")
 
@@ -79,9 +88,9 @@ print(f"Matplotlib version: {plt.matplotlib.__version__}")
 ## 🔄 Generate Sample Data for Analysis
 """
 
-def generate_comprehensive_dataset():
-    """Generate comprehensive AI risk assessment dataset"""
-    np.random.seed(42)
+def generate_comprehensive_dataset(verbose=False):
+    """Generate comprehensive AI risk assessment dataset (verbose=True adds a dtype breakdown)"""
+    rng = np.random.default_rng(42)
     
     print("🔄 Generating comprehensive AI risk assessment dataset...")
     
@@ -102,49 +111,69 @@ def generate_comprehensive_dataset():
     
     severity_levels = ['Low', 'Medium', 'High', 'Critical']
     regions = ['North America', 'Europe', 'Asia-Pacific', 'Latin America', 'Middle East/Africa']
+    organization_sizes = ['Small', 'Medium', 'Large', 'Enterprise']
     
     # Generate 2000 records
     n_records = 2000
     
+    # Uniform 3-hour reporting grid
+    report_timestamps = np.datetime64('2023-01-01', 'ns') + np.arange(n_records) * np.timedelta64(3, 'h')
+    
+    # Categorical columns are sampled as integer codes over their fixed vocabularies;
+    # bounded scores and counts are stored at the narrowest dtype that holds them
     data = {
-        'record_id': range(1, n_records + 1),
-        'sector': np.random.choice(sectors, n_records),
-        'ai_tool': np.random.choice(ai_tools, n_records),
-        'risk_type': np.random.choice(risk_types, n_records),
-        'severity': np.random.choice(severity_levels, n_records, p=[0.15, 0.35, 0.35, 0.15]),
-        'geographic_region': np.random.choice(regions, n_records),
-        'organization_size': np.random.choice(['Small', 'Medium', 'Large', 'Enterprise'], n_records),
-        'impact_score': np.random.uniform(1, 10, n_records),
-        'frequency_percentage': np.random.uniform(5, 95, n_records),
-        'mitigation_cost_usd': np.random.lognormal(8, 1.5, n_records),
-        'implementation_time_weeks': np.random.gamma(2, 5, n_records),
-        'effectiveness_score': np.random.uniform(3, 10, n_records),
-        'user_satisfaction_score': np.random.uniform(1, 10, n_records),
-        'regulatory_compliance': np.random.choice([0, 1], n_records, p=[0.25, 0.75]),
-        'reported_by_email': [f'analyst_{i}@organization.com' for i in range(n_records)],
-        'report_timestamp': pd.date_range('2023-01-01', periods=n_records, freq='3H'),
-        'follow_up_required': np.random.choice([True, False], n_records, p=[0.3, 0.7]),
-        'incident_count': np.random.poisson(2, n_records),
-        'resolution_time_days': np.random.exponential(7, n_records)
+        'record_id': np.arange(1, n_records + 1, dtype=np.uint16),
+        'sector': pd.Categorical.from_codes(rng.integers(0, len(sectors), n_records), categories=sectors),
+        'ai_tool': pd.Categorical.from_codes(rng.integers(0, len(ai_tools), n_records), categories=ai_tools),
+        'risk_type': pd.Categorical.from_codes(rng.integers(0, len(risk_types), n_records),
+                                               categories=risk_types),
+        'severity': pd.Categorical.from_codes(
+            rng.choice(len(severity_levels), n_records, p=[0.15, 0.35, 0.35, 0.15]),
+            categories=severity_levels, ordered=True
+        ),
+        'geographic_region': pd.Categorical.from_codes(rng.integers(0, len(regions), n_records),
+                                                       categories=regions),
+        'organization_size': pd.Categorical.from_codes(rng.integers(0, len(organization_sizes), n_records),
+                                                       categories=organization_sizes),
+        'impact_score': rng.uniform(1, 10, n_records).astype(np.float32),
+        'frequency_percentage': rng.uniform(5, 95, n_records).astype(np.float32),
+        'mitigation_cost_usd': rng.lognormal(8, 1.5, n_records),  # kept float64 for the cost ratio
+        'implementation_time_weeks': rng.gamma(2, 5, n_records).astype(np.float32),
+        'effectiveness_score': rng.uniform(3, 10, n_records).astype(np.float32),
+        'user_satisfaction_score': rng.uniform(1, 10, n_records).astype(np.float32),
+        'regulatory_compliance': rng.choice([0, 1], n_records, p=[0.25, 0.75]).astype(np.uint8),
+        # Arrow-backed strings, concatenated column-wise rather than formatted row by row
+        'reported_by_email': 'analyst_' + pd.Series(np.arange(n_records)).astype('string[pyarrow]') + '@organization.com',
+        'report_timestamp': report_timestamps,
+        'follow_up_required': rng.choice([True, False], n_records, p=[0.3, 0.7]),
+        'incident_count': rng.poisson(2, n_records).astype(np.uint8),
+        'resolution_time_days': rng.exponential(7, n_records).astype(np.float32)
     }
     
     df = pd.DataFrame(data)
     
     # Create derived features
-    df['risk_score'] = (df['impact_score'] * df['frequency_percentage'] / 100).round(2)
+    # Widen before multiplying so the rounded score is not float32 noise
+    df['risk_score'] = (df['impact_score'].astype(np.float64) * df['frequency_percentage'] / 100).round(2)
     df['cost_effectiveness_ratio'] = (df['effectiveness_score'] / (df['mitigation_cost_usd'] / 1000)).round(4)
-    df['urgency_level'] = pd.cut(df['risk_score'], bins=[0, 2, 4, 6, 10], 
-                               labels=['Low', 'Medium', 'High', 'Critical'])
-    df['month'] = df['report_timestamp'].dt.to_period('M')
-    df['quarter'] = df['report_timestamp'].dt.to_period('Q')
+    # Right-closed buckets (0, 2], (2, 4], (4, 6], (6, 10] as with pd.cut
+    urgency_codes = np.searchsorted([2, 4, 6], df['risk_score'].to_numpy(), side='left').astype(np.int8)
+    df['urgency_level'] = pd.Categorical.from_codes(urgency_codes, categories=['Low', 'Medium', 'High', 'Critical'],
+                                                    ordered=True)
+    # Integer period codes (year * 12 + month - 1, year * 4 + quarter - 1)
+    month_code = (report_timestamps.astype('datetime64[M]').astype(np.int64) + 1970 * 12).astype(np.int16)
+    df['month'] = month_code
+    df['quarter'] = month_code // 3
     
     # Add some realistic data issues for cleaning demonstration
-    df.loc[np.random.choice(df.index, 100), 'mitigation_cost_usd'] = np.nan
-    df.loc[np.random.choice(df.index, 50), 'effectiveness_score'] = np.nan
+    missing_rows = rng.choice(n_records, 150, replace=False)
+    df.loc[missing_rows[:100], 'mitigation_cost_usd'] = np.nan
+    df.loc[missing_rows[100:], 'effectiveness_score'] = np.nan
     
     print(f"✅ Generated {len(df)} records with {len(df.columns)} features")
     print(f"📊 Data shape: {df.shape}")
-    print(f"🔍 Data types: {df.dtypes.value_counts().to_dict()}")
+    if verbose:
+        print(f"🔍 Data types: {df.dtypes.value_counts().to_dict()}")
     
     return df
 
@@ -155,17 +184,20 @@ df = generate_comprehensive_dataset()
 print("\n📋 Dataset Overview:")
 print(df.head())
 print(f"\n📊 Dataset Info:")
-print(df.info())
+print(f"shape={df.shape}, memory_mb={df.memory_usage(deep=False).sum() / 1e6:.2f}")
 
 # Cell 4: Data Cleaning and Preprocessing
 """
 ## 🧹 Data Cleaning and Preprocessing
 """
 
-def comprehensive_data_cleaning(df):
-    """Perform comprehensive data cleaning"""
+def comprehensive_data_cleaning(df, inplace=False):
+    """Perform comprehensive data cleaning (pass inplace=True to clean the input frame itself)"""
     print("🔄 Starting comprehensive data cleaning process...")
     
+    if not inplace:
+        df = df.copy()
+    
     original_shape = df.shape
     cleaning_report = {
         'original_records': original_shape[0],
@@ -174,22 +206,23 @@ def comprehensive_data_cleaning(df):
     
     # 1. Handle missing values
     print("🔍 Handling missing values...")
-    missing_before = df.isnull().sum().sum()
+    null_counts = df.isnull().sum()
+    missing_before = null_counts.sum()
     
     # Fill numerical columns with median
-    numerical_cols = df.select_dtypes(include=[np.number]).columns
-    for col in numerical_cols:
-        if df[col].isnull().sum() > 0:
-            median_val = df[col].median()
-            df[col].fillna(median_val, inplace=True)
+    numerical_cols = [col for col in df.select_dtypes(include=[np.number]).columns if null_counts[col] > 0]
+    if numerical_cols:
+        medians = df[numerical_cols].median()
+        df[numerical_cols] = df[numerical_cols].fillna(medians)
+        for col, median_val in medians.items():
             print(f"  - Filled {col} missing values with median: {median_val:.2f}")
     
     # Fill categorical columns with mode
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns
-    for col in categorical_cols:
-        if df[col].isnull().sum() > 0:
-            mode_val = df[col].mode()[0]
-            df[col].fillna(mode_val, inplace=True)
+    categorical_cols = [col for col in df.select_dtypes(include=['object', 'string', 'category']).columns if null_counts[col] > 0]
+    if categorical_cols:
+        modes = df[categorical_cols].mode().iloc[0]
+        df[categorical_cols] = df[categorical_cols].fillna(modes)
+        for col, mode_val in modes.items():
             print(f"  - Filled {col} missing values with mode: {mode_val}")
     
     missing_after = df.isnull().sum().sum()
@@ -197,42 +230,39 @@ def comprehensive_data_cleaning(df):
     
     # 2. Handle outliers
     print("🔍 Detecting and handling outliers...")
-    outliers_handled = 0
-    
-    for col in ['impact_score', 'effectiveness_score', 'user_satisfaction_score']:
-        if col in df.columns:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = max(1, Q1 - 1.5 * IQR)
-            upper_bound = min(10, Q3 + 1.5 * IQR)
-            
-            outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
-            outliers_handled += len(outliers)
-            
-            df[col] = df[col].clip(lower=lower_bound, upper=upper_bound)
-            print(f"  - Handled {len(outliers)} outliers in {col}")
-    
-    cleaning_report['outliers_handled'] = outliers_handled
+    score_cols = [col for col in ['impact_score', 'effectiveness_score', 'user_satisfaction_score']
+                  if col in df.columns]
+    
+    # IQR bounds for all score columns from one quantile pass (gaps were filled above),
+    # capped to the 1-10 scale
+    scores = df[score_cols].to_numpy(dtype=np.float32)
+    Q1, Q3 = np.quantile(scores, [0.25, 0.75], axis=0)
+    IQR = Q3 - Q1
+    lower_bound = np.maximum(1, Q1 - 1.5 * IQR)
+    upper_bound = np.minimum(10, Q3 + 1.5 * IQR)
+    
+    outlier_counts = ((scores < lower_bound) | (scores > upper_bound)).sum(axis=0)
+    np.clip(scores, lower_bound, upper_bound, out=scores)
+    df[score_cols] = scores
+    for col, n_outliers in zip(score_cols, outlier_counts):
+        print(f"  - Handled {n_outliers} outliers in {col}")
+    
+    cleaning_report['outliers_handled'] = int(outlier_counts.sum())
     
     # 3. Data validation
     print("🔍 Validating data consistency...")
     
     # Ensure scores are within valid ranges
-    score_columns = ['impact_score', 'effectiveness_score', 'user_satisfaction_score']
-    for col in score_columns:
-        if col in df.columns:
-            df[col] = df[col].clip(1, 10)
+    df[score_cols] = df[score_cols].clip(1, 10)
     
     # Ensure percentages are within 0-100
     if 'frequency_percentage' in df.columns:
         df['frequency_percentage'] = df['frequency_percentage'].clip(0, 100)
     
     # Remove duplicates
-    duplicates_before = df.duplicated().sum()
+    records_before = len(df)
     df = df.drop_duplicates()
-    duplicates_removed = duplicates_before - df.duplicated().sum()
-    cleaning_report['duplicates_removed'] = duplicates_removed
+    cleaning_report['duplicates_removed'] = records_before - len(df)
     
     # Final shape
     final_shape = df.shape
@@ -248,8 +278,8 @@ def comprehensive_data_cleaning(df):
     
     return df, cleaning_report
 
-# Clean the data
-cleaned_df, cleaning_report = comprehensive_data_cleaning(df.copy())
+# Clean the data (in place: the raw frame is not used again)
+cleaned_df, cleaning_report = comprehensive_data_cleaning(df, inplace=True)
 
 # Display cleaning results
 print("\n📋 Cleaning Report:")
@@ -267,7 +297,7 @@ def perform_eda(df):
     
     # 1. Distribution Analysis
     print("\n📊 1. Distribution Analysis")
-    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10), constrained_layout=True)
     
     # Risk Score Distribution
     axes[0,0].hist(df['risk_score'], bins=30, alpha=0.7, color='skyblue', edgecolor='black')
@@ -289,19 +319,19 @@ def perform_eda(df):
     axes[1,0].tick_params(axis='x', rotation=45)
     
     # Impact vs Frequency Scatter
-    scatter = axes[1,1].scatter(df['impact_score'], df['frequency_percentage'], 
-                               c=df['risk_score'], cmap='viridis', alpha=0.6)
+    # Rasterized so the points render as one image instead of a path per marker
+    scatter = axes[1,1].scatter(df['impact_score'].to_numpy(), df['frequency_percentage'].to_numpy(),
+                               c=df['risk_score'].to_numpy(), cmap='viridis', alpha=0.6, rasterized=True)
     axes[1,1].set_title('Impact vs Frequency (colored by Risk Score)')
     axes[1,1].set_xlabel('Impact Score')
     axes[1,1].set_ylabel('Frequency Percentage')
     plt.colorbar(scatter, ax=axes[1,1], label='Risk Score')
     
-    plt.tight_layout()
     plt.show()
     
     # 2. Sector Analysis
     print("\n🏢 2. Sector-wise Analysis")
-    sector_analysis = df.groupby('sector').agg({
+    sector_analysis = df.groupby('sector', observed=True).agg({
         'risk_score': ['mean', 'std', 'count'],
         'impact_score': 'mean',
         'frequency_percentage': 'mean',
@@ -313,7 +343,7 @@ def perform_eda(df):
     
     # 3. Risk Type Analysis
     print("\n⚠️ 3. Risk Type Analysis")
-    risk_analysis = df.groupby('risk_type').agg({
+    risk_analysis = df.groupby('risk_type', observed=True, sort=False).agg({
         'risk_score': 'mean',
         'severity': lambda x: (x == 'Critical').sum(),
         'record_id': 'count'
@@ -324,14 +354,19 @@ def perform_eda(df):
     
     # 4. Correlation Analysis
     print("\n📈 4. Correlation Analysis")
-    numerical_cols = df.select_dtypes(include=[np.number]).columns
-    correlation_matrix = df[numerical_cols].corr()
-    
-    plt.figure(figsize=(12, 10))
+    numerical_cols = df.select_dtypes(include=[np.number]).columns.drop(['month', 'quarter'], errors='ignore')
+    # One contiguous float32 block; pandas' pairwise corr is only needed if gaps remain
+    numeric_values = np.ascontiguousarray(df[numerical_cols].to_numpy(dtype=np.float32))
+    if np.isnan(numeric_values).any():
+        correlation_matrix = df[numerical_cols].corr()
+    else:
+        correlation_matrix = pd.DataFrame(np.corrcoef(numeric_values, rowvar=False),
+                                          index=numerical_cols, columns=numerical_cols)
+    
+    plt.figure(figsize=(12, 10), constrained_layout=True)
     sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0,
                 square=True, linewidths=0.5)
     plt.title('Correlation Matrix of Numerical Variables')
-    plt.tight_layout()
     plt.show()
     
     # 5. Time Series Analysis
@@ -340,25 +375,25 @@ def perform_eda(df):
         'risk_score': 'mean',
         'record_id': 'count'
     }).round(2)
+    monthly_trends.index = [f"{code // 12}-{code % 12 + 1:02d}" for code in monthly_trends.index]
     
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), constrained_layout=True)
     
     # Average risk score over time
-    ax1.plot(monthly_trends.index.astype(str), monthly_trends['risk_score'], 
+    ax1.plot(monthly_trends.index, monthly_trends['risk_score'], 
              marker='o', linewidth=2, markersize=6)
     ax1.set_title('Average Risk Score Over Time')
     ax1.set_ylabel('Average Risk Score')
     ax1.grid(True, alpha=0.3)
     
     # Number of reports over time
-    ax2.bar(monthly_trends.index.astype(str), monthly_trends['record_id'], 
+    ax2.bar(monthly_trends.index, monthly_trends['record_id'], 
             color='lightblue', alpha=0.7)
     ax2.set_title('Number of Reports Over Time')
     ax2.set_xlabel('Month')
     ax2.set_ylabel('Number of Reports')
     ax2.tick_params(axis='x', rotation=45)
     
-    plt.tight_layout()
     plt.show()
     
     return sector_analysis, risk_analysis, correlation_matrix, monthly_trends
@@ -371,9 +406,10 @@ sector_stats, risk_stats, correlations, time_trends = perform_eda(cleaned_df)
 ## 🎯 Advanced Statistical Analysis
 """
 
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score
 
@@ -381,20 +417,27 @@ def advanced_statistical_analysis(df):
     """Perform advanced statistical analysis including clustering and prediction"""
     print("🔬 Performing Advanced Statistical Analysis...")
     
+    features_for_clustering = ['impact_score', 'frequency_percentage', 'mitigation_cost_usd', 
+                              'effectiveness_score', 'user_satisfaction_score']
+    features_for_prediction = ['impact_score', 'frequency_percentage', 'mitigation_cost_usd', 
+                              'effectiveness_score', 'user_satisfaction_score', 'incident_count']
+    
     # 1. Clustering Analysis
     print("\n🎯 1. Clustering Analysis")
     
     # Prepare features for clustering
-    features_for_clustering = ['impact_score', 'frequency_percentage', 'mitigation_cost_usd', 
-                              'effectiveness_score', 'user_satisfaction_score']
     X_cluster = df[features_for_clustering].fillna(df[features_for_clustering].mean())
     
     # Standardize features
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X_cluster)
     
-    # Perform K-means clustering
-    kmeans = KMeans(n_clusters=4, random_state=42)
+    # Perform K-means clustering; one k-means++ start is enough at this size,
+    # and mini-batches keep very large inputs linear in the number of rows
+    if len(X_scaled) > 50_000:
+        kmeans = MiniBatchKMeans(n_clusters=4, batch_size=256, n_init=1, random_state=42)
+    else:
+        kmeans = KMeans(n_clusters=4, n_init=1, random_state=42)
     clusters = kmeans.fit_predict(X_scaled)
     
     # Add cluster labels to dataframe
@@ -442,33 +485,32 @@ def advanced_statistical_analysis(df):
     # 2. Predictive Modeling
     print("\n🤖 2. Predictive Modeling")
     
-    # Prepare features for prediction
-    features_for_prediction = ['impact_score', 'frequency_percentage', 'mitigation_cost_usd', 
-                              'effectiveness_score', 'user_satisfaction_score', 'incident_count']
-    X_pred = df[features_for_prediction].fillna(df[features_for_prediction].mean())
+    # Prepare features for prediction (histogram boosting handles any gaps natively)
+    X_pred = df[features_for_prediction]
     
-    # Encode severity levels
-    severity_mapping = {'Low': 0, 'Medium': 1, 'High': 2, 'Critical': 3}
-    y_pred = df['severity'].map(severity_mapping)
+    # Encode severity levels as their ordered categorical codes (Low=0 ... Critical=3)
+    severity_labels = ['Low', 'Medium', 'High', 'Critical']
+    y_pred = pd.Categorical(df['severity'], categories=severity_labels, ordered=True).codes.astype(np.int8)
     
     # Split data
     X_train, X_test, y_train, y_test = train_test_split(X_pred, y_pred, 
                                                         test_size=0.2, random_state=42)
     
-    # Train Random Forest model
-    rf_model = RandomForestClassifier(n_estimators=100, random_state=42)
-    rf_model.fit(X_train, y_train)
+    # Train Histogram Gradient Boosting model
+    gb_model = HistGradientBoostingClassifier(max_iter=100, early_stopping=True, random_state=42)
+    gb_model.fit(X_train, y_train)
     
     # Make predictions
-    y_pred_rf = rf_model.predict(X_test)
-    accuracy = accuracy_score(y_test, y_pred_rf)
+    y_pred_gb = gb_model.predict(X_test)
+    accuracy = accuracy_score(y_test, y_pred_gb)
     
     print(f"Model Accuracy: {accuracy:.3f}")
     
-    # Feature importance
+    # Feature importance (histogram boosting has no impurity importances)
+    importance = permutation_importance(gb_model, X_test, y_test, n_repeats=5, random_state=42)
     feature_importance = pd.DataFrame({
         'feature': features_for_prediction,
-        'importance': rf_model.feature_importances_
+        'importance': importance.importances_mean
     }).sort_values('importance', ascending=False)
     
     print("\nFeature Importance:")
@@ -485,11 +527,10 @@ def advanced_statistical_analysis(df):
     plt.show()
     
     # Classification report
-    severity_labels = ['Low', 'Medium', 'High', 'Critical']
     print("\nClassification Report:")
-    print(classification_report(y_test, y_pred_rf, target_names=severity_labels))
+    print(classification_report(y_test, y_pred_gb, target_names=severity_labels))
     
-    return cluster_analysis, feature_importance, accuracy, rf_model
+    return cluster_analysis, feature_importance, accuracy, gb_model
 
 # Perform advanced analysis
 cluster_results, feature_imp, model_accuracy, trained_model = advanced_statistical_analysis(cleaned_df)
@@ -499,8 +540,13 @@ cluster_results, feature_imp, model_accuracy, trained_model = advanced_statistic
 ## 📤 Data Export and Comprehensive Reporting
 """
 
-def generate_comprehensive_report(df, cleaning_report, cluster_results, feature_importance, model_accuracy):
-    """Generate comprehensive analysis report"""
+def generate_comprehensive_report(df, cleaning_report, cluster_results, feature_importance, model_accuracy,
+                                  sector_analysis=None, risk_analysis=None):
+    """Generate comprehensive analysis report
+    
+    Pass the sector and risk type tables from perform_eda to reuse their
+    aggregations instead of grouping the data again.
+    """
     
     print("📊 COMPREHENSIVE AI RISK ASSESSMENT ANALYSIS REPORT")
     print("=" * 70)
@@ -527,14 +573,21 @@ def generate_comprehensive_report(df, cleaning_report, cluster_results, feature_
     # Sector Analysis
     print("\n🏢 SECTOR ANALYSIS")
     print("-" * 20)
-    sector_risks = df.groupby('sector')['risk_score'].mean().sort_values(ascending=False)
+    if sector_analysis is not None:
+        sector_risks = sector_analysis[('risk_score', 'mean')]
+    else:
+        sector_risks = df.groupby('sector', observed=True)['risk_score'].mean()
+    sector_risks = sector_risks.sort_values(ascending=False)
     for sector, risk_score in sector_risks.items():
         print(f"• {sector}: {risk_score:.2f} average risk score")
     
     # Top Risk Types
     print("\n⚠️ TOP RISK CATEGORIES")
     print("-" * 25)
-    risk_counts = df['risk_type'].value_counts().head(5)
+    if risk_analysis is not None:
+        risk_counts = risk_analysis['Total_Reports'].sort_values(ascending=False).head(5)
+    else:
+        risk_counts = df['risk_type'].value_counts().head(5)
     for risk_type, count in risk_counts.items():
         percentage = count / total_records * 100
         print(f"• {risk_type}: {count} cases ({percentage:.1f}%)")
@@ -542,7 +595,7 @@ def generate_comprehensive_report(df, cleaning_report, cluster_results, feature_
     # AI Tools Analysis
     print("\n🤖 AI TOOLS ANALYSIS")
     print("-" * 22)
-    tool_analysis = df.groupby('ai_tool').agg({
+    tool_analysis = df.groupby('ai_tool', observed=True).agg({
         'risk_score': 'mean',
         'record_id': 'count'
     }).sort_values('risk_score', ascending=False).head(5)
@@ -575,14 +628,15 @@ def generate_comprehensive_report(df, cleaning_report, cluster_results, feature_
     print(f"• Outlier Detection: {cleaning_report['outliers_handled']} outliers processed")
     print(f"• Clustering: 4 distinct risk profiles identified")
     print(f"• Feature Engineering: {len(df.columns)} features analyzed")
-    print(f"• Model Type: Random Forest Classifier")
+    print(f"• Model Type: Histogram Gradient Boosting Classifier")
     print(f"• Cross-validation: 80/20 train-test split")
     
     return True
 
 # Generate comprehensive report
 report_generated = generate_comprehensive_report(cleaned_df, cleaning_report, 
-                                               cluster_results, feature_imp, model_accuracy)
+                                               cluster_results, feature_imp, model_accuracy,
+                                               sector_analysis=sector_stats, risk_analysis=risk_stats)
 
 # Export data in multiple formats
 def export_analysis_data(df, format_type='all'):
@@ -592,15 +646,30 @@ def export_analysis_data(df, format_type='all'):
     
     exported_files = []
     
+    # month/quarter are held as int16 period codes; export them as periods again
+    month_starts = pd.DatetimeIndex(
+        (df['month'].to_numpy(np.int64) - 1970 * 12).astype('datetime64[M]').astype('datetime64[ns]')
+    )
+    df = df.assign(month=month_starts.to_period('M'), quarter=month_starts.to_period('Q'))
+    
     if format_type in ['all', 'csv']:
         csv_filename = f"{base_filename}.csv"
         df.to_csv(csv_filename, index=False)
         exported_files.append(csv_filename)
         print(f"✅ Data exported to {csv_filename}")
     
-    if format_type in ['all', 'excel']:
+    if format_type in ['all', 'parquet']:
+        parquet_filename = f"{base_filename}.parquet"
+        df.to_parquet(parquet_filename, engine='pyarrow', compression='zstd', index=False)
+        exported_files.append(parquet_filename)
+        print(f"✅ Data exported to {parquet_filename}")
+    
+    # The workbook is for people rather than pipelines, so it is only written on request
+    if format_type == 'excel':
         excel_filename = f"{base_filename}.xlsx"
-        with pd.ExcelWriter(excel_filename, engine='openpyxl') as writer:
+        # xlsxwriter's constant_memory mode is not usable here: pandas writes cells
+        # column by column and that mode keeps only the latest row
+        with pd.ExcelWriter(excel_filename, engine='xlsxwriter') as writer:
             df.to_excel(writer, sheet_name='Risk_Assessments', index=False)
             sector_stats.to_excel(writer, sheet_name='Sector_Analysis')
             risk_stats.to_excel(writer, sheet_name='Risk_Analysis')
@@ -610,25 +679,29 @@ def export_analysis_data(df, format_type='all'):
     
     if format_type in ['all', 'json']:
         json_filename = f"{base_filename}.json"
-        export_dict = {
-            'metadata': {
-                'generated_by': '[Your Name]',
-                'generation_date': datetime.now().isoformat(),
-                'total_records': len(df),
-                'analysis_type': 'Comprehensive AI Risk Assessment'
-            },
-            'summary_statistics': {
-                'average_risk_score': df['risk_score'].mean(),
-                'total_sectors': df['sector'].nunique(),
-                'total_ai_tools': df['ai_tool'].nunique(),
-                'severity_distribution': df['severity'].value_counts().to_dict()
-            },
-            'data': df.to_dict('records')
+        metadata = {
+            'generated_by': '[Your Name]',
+            'generation_date': datetime.now().isoformat(),
+            'total_records': len(df),
+            'analysis_type': 'Comprehensive AI Risk Assessment'
+        }
+        summary_statistics = {
+            'average_risk_score': float(df['risk_score'].mean()),
+            'total_sectors': df['sector'].nunique(),
+            'total_ai_tools': df['ai_tool'].nunique(),
+            'severity_distribution': {str(k): int(v) for k, v in df['severity'].value_counts().items()}
         }
         
         import json
+        # Records are streamed by to_json rather than built as a list of dicts
         with open(json_filename, 'w') as f:
-            json.dump(export_dict, f, indent=2, default=str)
+            f.write('{"metadata": ')
+            json.dump(metadata, f, indent=2)
+            f.write(',\n"summary_statistics": ')
+            json.dump(summary_statistics, f, indent=2, default=str)
+            f.write(',\n"data": ')
+            df.to_json(f, orient='records', date_format='iso', default_handler=str)
+            f.write('}\n')
         exported_files.append(json_filename)
         print(f"✅ JSON export completed: {json_filename}")
     
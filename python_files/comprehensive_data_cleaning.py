@@ -62,36 +62,48 @@ class AIRiskDataCleaner:
         # Generate 1000 sample records
         n_records = 1000
         
+        # Label columns are drawn as integer codes into their vocabularies
         data = {
-            'id': range(1, n_records + 1),
-            'ai_tool': np.random.choice(ai_tools, n_records),
-            'risk_type': np.random.choice(risk_types, n_records),
-            'severity': np.random.choice(severity_levels, n_records, p=[0.2, 0.3, 0.3, 0.2]),
-            'sector': np.random.choice(sectors, n_records),
+            'id': np.arange(1, n_records + 1, dtype=np.int32),
+            'ai_tool': pd.Categorical.from_codes(np.random.choice(len(ai_tools), n_records), categories=ai_tools),
+            'risk_type': pd.Categorical.from_codes(np.random.choice(len(risk_types), n_records),
+                                                   categories=risk_types),
+            'severity': pd.Categorical.from_codes(
+                np.random.choice(len(severity_levels), n_records, p=[0.2, 0.3, 0.3, 0.2]),
+                categories=severity_levels
+            ),
+            'sector': pd.Categorical.from_codes(np.random.choice(len(sectors), n_records), categories=sectors),
             'impact_score': np.random.uniform(1, 10, n_records),
             'frequency_percentage': np.random.uniform(0, 100, n_records),
             'mitigation_cost': np.random.uniform(1000, 100000, n_records),
             'implementation_time': np.random.uniform(1, 52, n_records),  # weeks
             'effectiveness_score': np.random.uniform(1, 10, n_records),
-            'reported_by': [f'user_{i}@domain.com' for i in range(n_records)],
-            'report_date': pd.date_range(start='2023-01-01', periods=n_records, freq='H'),
+            'reported_by': np.char.add(np.char.add('user_', np.arange(n_records).astype(str)), '@domain.com'),
+            'report_date': np.datetime64('2023-01-01', 'ns') + np.arange(n_records) * np.timedelta64(1, 'h'),
             'description_length': np.random.randint(10, 500, n_records),
             'follow_up_required': np.random.choice([True, False], n_records, p=[0.3, 0.7])
         }
         
         df = pd.DataFrame(data)
         
+        # Bounded scores, costs and durations fit in float32; description_length is float32
+        # rather than int16 because it carries the injected gaps below
+        df = df.astype({
+            'impact_score': 'float32', 'frequency_percentage': 'float32', 'mitigation_cost': 'float32',
+            'implementation_time': 'float32', 'effectiveness_score': 'float32', 'description_length': 'float32'
+        })
+        
         # Introduce some data quality issues for cleaning demonstration
         # Missing values
         df.loc[np.random.choice(df.index, 50), 'description_length'] = np.nan
         df.loc[np.random.choice(df.index, 30), 'mitigation_cost'] = np.nan
         
         # Duplicates
-        duplicate_indices = np.random.choice(df.index, 25)
-        df = pd.concat([df, df.iloc[duplicate_indices]], ignore_index=True)
+        duplicate_indices = np.random.choice(n_records, 25)
+        df = df.iloc[np.concatenate([np.arange(n_records), duplicate_indices])].reset_index(drop=True)
         
         # Outliers
-        df.loc[np.random.choice(df.index, 20), 'impact_score'] = np.random.uniform(15, 20, 20)
+        df.loc[np.random.choice(df.index, 20), 'impact_score'] = np.random.uniform(15, 20, 20).astype(np.float32)
         
         return df
     
@@ -105,46 +117,51 @@ class AIRiskDataCleaner:
         print("🔄 Starting comprehensive data cleaning process...")
         
         # 1. Handle duplicates
-        duplicates_before = df.duplicated().sum()
+        records_before = len(df)
         df = df.drop_duplicates()
-        duplicates_removed = duplicates_before - df.duplicated().sum()
+        duplicates_removed = records_before - len(df)
         self.cleaning_report['duplicates_removed'] = duplicates_removed
         print(f"✅ Removed {duplicates_removed} duplicate records")
         
-        # 2. Handle missing values
-        missing_before = df.isnull().sum().sum()
-        
-        # Fill missing numerical values with median
-        numerical_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numerical_cols:
-            if df[col].isnull().sum() > 0:
-                df[col].fillna(df[col].median(), inplace=True)
-        
-        # Fill missing categorical values with mode
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        for col in categorical_cols:
-            if df[col].isnull().sum() > 0:
-                df[col].fillna(df[col].mode()[0], inplace=True)
+        # Label columns are counted as small integer codes from here on; the cast runs
+        # on the deduplicated copy so the caller's frame is left as it was
+        for col in ['ai_tool', 'risk_type', 'severity', 'sector']:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
         
-        missing_after = df.isnull().sum().sum()
+        # 2. Handle missing values
+        null_counts = df.isnull().sum()
+        missing_before = int(null_counts.sum())
+        cols_with_nulls = null_counts.index[null_counts > 0]
+        
+        # Fill missing numerical values with median and categorical values with mode,
+        # each computed over its block and applied to the gap columns only
+        numerical_cols = df[cols_with_nulls].select_dtypes(include=[np.number]).columns
+        categorical_cols = df[cols_with_nulls].select_dtypes(include=['object', 'category']).columns
+        fill_values = df[numerical_cols].median().to_dict()
+        if len(categorical_cols):
+            fill_values.update(df[categorical_cols].mode().iloc[0].to_dict())
+        df[cols_with_nulls] = df[cols_with_nulls].fillna(fill_values)
+        
+        # Only the columns that had gaps can still have any
+        missing_after = int(df[cols_with_nulls].isnull().sum().sum())
         self.cleaning_report['missing_values_handled'] = missing_before - missing_after
         print(f"✅ Handled {missing_before - missing_after} missing values")
         
-        # 3. Handle outliers
-        outliers_detected = 0
-        for col in ['impact_score', 'effectiveness_score']:
-            if col in df.columns:
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
-                outliers_detected += len(outliers)
-                
-                # Cap outliers instead of removing them
-                df[col] = df[col].clip(lower=max(1, lower_bound), upper=min(10, upper_bound))
+        # 3. Handle outliers (IQR bounds for all score columns from one quantile call
+        # over a single array; numeric gaps were filled above)
+        score_cols = [col for col in ['impact_score', 'effectiveness_score'] if col in df.columns]
+        scores = df[score_cols].to_numpy(dtype=np.result_type(*df[score_cols].dtypes, np.float32))
+        Q1, Q3 = np.quantile(scores, [0.25, 0.75], axis=0)
+        IQR = Q3 - Q1
+        lower_bound = Q1 - 1.5 * IQR
+        upper_bound = Q3 + 1.5 * IQR
+        
+        outliers_detected = int(((scores < lower_bound) | (scores > upper_bound)).sum())
+        
+        # Cap outliers instead of removing them
+        np.clip(scores, np.maximum(1, lower_bound), np.minimum(10, upper_bound), out=scores)
+        df[score_cols] = scores
         
         self.cleaning_report['outliers_detected'] = outliers_detected
         print(f"✅ Detected and handled {outliers_detected} outliers")
@@ -208,7 +225,7 @@ class AIRiskDataCleaner:
             df.to_csv(f"{filename}.csv", index=False)
             print(f"✅ Data exported to {filename}.csv")
         elif format.lower() == 'json':
-            df.to_json(f"{filename}.json", orient='records', indent=2)
+            df.to_json(f"{filename}.json", orient='records')
             print(f"✅ Data exported to {filename}.json")
         elif format.lower() == 'excel':
             df.to_excel(f"{filename}.xlsx", index=False)
@@ -216,7 +233,7 @@ class AIRiskDataCleaner:
         
         return f"{filename}.{format.lower()}"
 
-def run_comprehensive_cleaning():
+def run_comprehensive_cleaning(export_formats=('csv',)):
     """Main function to run the comprehensive cleaning process"""
     print("🚀 Starting AI Risk Assessment Data Cleaning Process")
     print("Author: [Your Name] | Date: December 2024")
@@ -236,9 +253,9 @@ def run_comprehensive_cleaning():
     # Generate report
     report = cleaner.generate_cleaning_report()
     
-    # Export cleaned data
-    cleaner.export_cleaned_data(cleaned_df, 'csv')
-    cleaner.export_cleaned_data(cleaned_df, 'json')
+    # Export cleaned data (CSV only unless other formats are requested)
+    for export_format in export_formats:
+        cleaner.export_cleaned_data(cleaned_df, export_format)
     
     return cleaned_df, report
 
@@ -14,6 +14,9 @@ import warnings
 warnings.filterwarnings('ignore')
 
 class RiskAssessmentDataCleaner:
+    _EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    _WHITESPACE_RE = re.compile(r'\s+')
+    
     def __init__(self):
         self.ai_tools_mapping = {
             'chatgpt': 'ChatGPT/OpenAI',
@@ -66,6 +69,50 @@ class RiskAssessmentDataCleaner:
             'critical': 'Critical',
             'extreme': 'Critical'
         }
+        
+        # Compiled lookups for the vectorized standardizers used by clean_dataset
+        self._ai_tool_lookup = self._compile_mapping(self.ai_tools_mapping)
+        self._risk_type_lookup = self._compile_mapping(self.risk_types_mapping)
+        self._severity_lookup = self._compile_mapping(self.severity_mapping)
+    
+    @staticmethod
+    def _compile_mapping(mapping):
+        """Build one regex that captures every mapping key present in a string"""
+        # Each key sits in its own optional lookahead, so a single scan reports all
+        # keys found and the first one in dict order can win as in the loops below
+        pattern = re.compile('^' + ''.join(f'(?:(?=.*?({re.escape(key)})))?' for key in mapping))
+        return pattern, np.array(list(mapping.values()), dtype=object)
+    
+    @staticmethod
+    def _distinct(series):
+        """Factorize a column into row codes and its distinct values as strings"""
+        codes, uniques = pd.factorize(series)
+        return codes, pd.Series(uniques, dtype='string')
+    
+    @staticmethod
+    def _gather(codes, values, missing, index):
+        """Expand per-distinct-value results back to rows"""
+        # Missing values carry code -1, which picks up the trailing missing value
+        return pd.Series(np.append(np.asarray(values), missing)[codes], index=index)
+    
+    def _transform_distinct(self, series, transform, missing):
+        """Run a column transform over the distinct values only and gather the result back by code"""
+        codes, uniques = self._distinct(series)
+        return self._gather(codes, transform(uniques), missing, series.index)
+    
+    def _normalize_text(self, text):
+        """Vectorized equivalent of clean_text_field over a string Series"""
+        return text.str.lower().str.strip().str.replace(self._WHITESPACE_RE, ' ', regex=True)
+    
+    def _standardize_series(self, series, lookup, default):
+        """Vectorized equivalent of the standardize_* methods over a whole column"""
+        pattern, standard_names = lookup
+        
+        def match(text):
+            matches = self._normalize_text(text).str.extract(pattern).notna().to_numpy()
+            return pd.Series(np.where(matches.any(axis=1), standard_names[matches.argmax(axis=1)], default))
+        
+        return self._transform_distinct(series, match, default)
 
     def load_sample_data(self):
         """Generate sample data for demonstration"""
@@ -82,25 +129,29 @@ class RiskAssessmentDataCleaner:
         
         severities = ['Low', 'Medium', 'High', 'Critical']
         
-        data = []
-        for i in range(n_samples):
-            # Generate timestamps over the last 30 days
-            days_ago = np.random.randint(0, 30)
-            timestamp = datetime.now() - timedelta(days=days_ago)
-            
-            data.append({
-                'id': f'risk_{i+1:03d}',
-                'ai_tool': np.random.choice(ai_tools),
-                'risk_type': np.random.choice(risk_types),
-                'severity': np.random.choice(severities, p=[0.3, 0.35, 0.25, 0.1]),
-                'description': f'Sample risk description {i+1}',
-                'email': f'user{i+1}@example.com' if np.random.random() > 0.3 else '',
-                'report_requested': np.random.choice([True, False], p=[0.4, 0.6]),
-                'created_at': timestamp,
-                'updated_at': timestamp
-            })
-        
-        return pd.DataFrame(data)
+        # Each column is drawn in one call; labels are integer codes into their vocabularies
+        numbers = np.arange(1, n_samples + 1).astype(str)
+        
+        # Generate timestamps over the last 30 days
+        days_ago = np.random.randint(0, 30, n_samples)
+        timestamps = pd.Timestamp(datetime.now()) - pd.to_timedelta(days_ago, unit='D')
+        
+        ai_tool_codes = np.random.choice(len(ai_tools), n_samples)
+        risk_type_codes = np.random.choice(len(risk_types), n_samples)
+        severity_codes = np.random.choice(len(severities), n_samples, p=[0.3, 0.35, 0.25, 0.1])
+        has_email = np.random.random(n_samples) > 0.3
+        
+        return pd.DataFrame({
+            'id': np.char.add('risk_', np.char.zfill(numbers, 3)),
+            'ai_tool': pd.Categorical.from_codes(ai_tool_codes, categories=ai_tools),
+            'risk_type': pd.Categorical.from_codes(risk_type_codes, categories=risk_types),
+            'severity': pd.Categorical.from_codes(severity_codes, categories=severities),
+            'description': np.char.add('Sample risk description ', numbers),
+            'email': np.where(has_email, np.char.add(np.char.add('user', numbers), '@example.com'), ''),
+            'report_requested': np.random.choice([True, False], n_samples, p=[0.4, 0.6]),
+            'created_at': timestamps,
+            'updated_at': timestamps
+        })
 
     def clean_text_field(self, text):
         """Clean and standardize text fields"""
@@ -111,7 +162,7 @@ class RiskAssessmentDataCleaner:
         text = str(text).lower().strip()
         
         # Remove extra spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = self._WHITESPACE_RE.sub(' ', text)
         
         return text
 
@@ -159,8 +210,7 @@ class RiskAssessmentDataCleaner:
         if pd.isna(email) or email == '':
             return ''
         
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if re.match(email_pattern, str(email)):
+        if self._EMAIL_RE.match(str(email)):
             return str(email).lower()
         else:
             return ''  # Invalid email becomes empty
@@ -168,18 +218,11 @@ class RiskAssessmentDataCleaner:
     def remove_duplicates(self, df):
         """Remove duplicate entries based on key fields"""
         # Consider duplicates as same ai_tool, risk_type, and similar timestamp (within 1 hour)
-        df_sorted = df.sort_values('created_at')
-        
-        duplicates_mask = []
-        for i, row in df_sorted.iterrows():
-            is_duplicate = False
-            for j, prev_row in df_sorted.iloc[:df_sorted.index.get_loc(i)].iterrows():
-                if (row['ai_tool'] == prev_row['ai_tool'] and 
-                    row['risk_type'] == prev_row['risk_type'] and
-                    abs((row['created_at'] - prev_row['created_at']).total_seconds()) < 3600):
-                    is_duplicate = True
-                    break
-            duplicates_mask.append(not is_duplicate)
+        df_sorted = df.sort_values('created_at', kind='stable')
+        
+        # In time order the nearest earlier report of a pair is the previous row of its group
+        gap = df_sorted.groupby(['ai_tool', 'risk_type'], observed=True, sort=False)['created_at'].diff().dt.total_seconds()
+        duplicates_mask = ~(gap < 3600)
         
         return df_sorted[duplicates_mask].reset_index(drop=True)
 
@@ -188,39 +231,48 @@ class RiskAssessmentDataCleaner:
         print("Starting data cleaning process...")
         print(f"Initial dataset shape: {df.shape}")
         
-        # Create a copy to avoid modifying original
-        df_clean = df.copy()
+        # Cleaned columns are built as new Series and the frame is assembled from them,
+        # so the original is never modified and untouched columns are not copied
+        cleaned = {}
         
-        # Clean and standardize fields
+        # Clean and standardize fields; repeated raw values are only processed once
         print("Standardizing AI tools...")
-        df_clean['ai_tool'] = df_clean['ai_tool'].apply(self.standardize_ai_tool)
+        cleaned['ai_tool'] = self._standardize_series(df['ai_tool'], self._ai_tool_lookup, 'Other')
         
         print("Standardizing risk types...")
-        df_clean['risk_type'] = df_clean['risk_type'].apply(self.standardize_risk_type)
+        cleaned['risk_type'] = self._standardize_series(df['risk_type'], self._risk_type_lookup, 'Other')
         
         print("Standardizing severity levels...")
-        df_clean['severity'] = df_clean['severity'].apply(self.standardize_severity)
+        cleaned['severity'] = self._standardize_series(df['severity'], self._severity_lookup, 'Medium')
+        
+        # Standardized labels come from small fixed vocabularies; severity keeps its ranking
+        for col in ['ai_tool', 'risk_type']:
+            cleaned[col] = cleaned[col].astype('category')
+        cleaned['severity'] = pd.Categorical(cleaned['severity'], categories=['Low', 'Medium', 'High', 'Critical'],
+                                             ordered=True)
         
         print("Validating emails...")
-        df_clean['email'] = df_clean['email'].apply(self.validate_email)
+        email_codes, emails = self._distinct(df['email'])
+        valid_email = emails.str.match(self._EMAIL_RE, na=False).to_numpy(dtype=bool)
+        cleaned['email'] = self._gather(email_codes, emails.str.lower().where(valid_email, ''), '',
+                                        df.index).astype('string')
         
         # Clean description field
         print("Cleaning descriptions...")
-        df_clean['description'] = df_clean['description'].apply(
-            lambda x: self.clean_text_field(x) if pd.notna(x) else ''
-        )
+        cleaned['description'] = self._transform_distinct(df['description'], self._normalize_text, '')
+        
+        df_clean = pd.DataFrame({col: cleaned.get(col, df[col]) for col in df.columns}, index=df.index, copy=False)
+        
+        # Add derived fields (carried through the duplicate removal below); the
+        # validation mask already says which rows kept an email
+        df_clean['severity_score'] = (df_clean['severity'].cat.codes + 1).astype('int8')
+        
+        df_clean['has_email'] = self._gather(email_codes, valid_email, False, df.index)
         
         # Remove duplicates
         print("Removing duplicates...")
         df_clean = self.remove_duplicates(df_clean)
         
-        # Add derived fields
-        df_clean['severity_score'] = df_clean['severity'].map({
-            'Low': 1, 'Medium': 2, 'High': 3, 'Critical': 4
-        })
-        
-        df_clean['has_email'] = df_clean['email'] != ''
-        
         print(f"Final dataset shape: {df_clean.shape}")
         print("Data cleaning completed!")
         
@@ -267,9 +319,11 @@ class RiskAssessmentDataCleaner:
         axes[0,2].set_title('Risk Types Distribution')
         axes[0,2].set_ylabel('Number of Reports')
         
-        # 4. Timeline of Reports
-        df_clean['date'] = df_clean['created_at'].dt.date
-        timeline = df_clean.groupby('date').size()
+        # 4. Timeline of Reports (whole-day buckets by integer division of the nanosecond values)
+        ns_per_day = 86_400 * 10**9
+        day = df_clean['created_at'].dropna().to_numpy(dtype='datetime64[ns]').astype(np.int64) // ns_per_day
+        days, counts = np.unique(day, return_counts=True)
+        timeline = pd.Series(counts, index=(days * ns_per_day).astype('datetime64[ns]'))
         axes[1,0].plot(timeline.index, timeline.values, marker='o')
         axes[1,0].set_title('Reports Timeline')
         axes[1,0].set_xlabel('Date')
@@ -321,9 +375,10 @@ def run_data_cleaning_example():
     # Create visualizations
     fig = cleaner.visualize_cleaning_results(df_clean, report)
     
-    # Save cleaned data
+    # Save cleaned data; the Parquet copy keeps the dtypes for risk_analysis.py
     df_clean.to_csv('cleaned_risk_assessments.csv', index=False)
-    print(f"\nCleaned data saved to 'cleaned_risk_assessments.csv'")
+    df_clean.to_parquet('cleaned_risk_assessments.parquet', engine='pyarrow', compression='zstd', index=False)
+    print(f"\nCleaned data saved to 'cleaned_risk_assessments.csv' and 'cleaned_risk_assessments.parquet'")
     
     return df_clean, report
 
@@ -19,16 +19,25 @@ def install_packages():
         'scipy',
         'plotly',
         'psycopg2-binary',  # For PostgreSQL connection
-        'python-dotenv'
+        'python-dotenv',
+        'orjson',  # For fast JSON export of analysis results
+        'pyarrow'  # For Parquet files and fast CSV reading
     ]
     
     print("Installing required packages...")
-    for package in packages:
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-            print(f"✓ {package} installed successfully")
-        except subprocess.CalledProcessError:
-            print(f"✗ Failed to install {package}")
+    try:
+        # One pip run resolves and downloads the whole set together
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "--no-input", "-q", *packages])
+    except subprocess.CalledProcessError:
+        # Fall back to one package at a time to isolate the failing one
+        print("Batch install failed, retrying packages individually...")
+        for package in packages:
+            try:
+                subprocess.check_call([sys.executable, "-m", "pip", "install", "--no-input", "-q", package])
+                print(f"✓ {package} installed successfully")
+            except subprocess.CalledProcessError:
+                print(f"✗ Failed to install {package}")
+        return
     
     print("\nAll packages installed!")
 
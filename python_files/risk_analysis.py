@@ -6,33 +6,66 @@ Advanced analytics and insights generation for risk assessment data.
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import LabelEncoder
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import os
+from scipy import sparse
+from sklearn.cluster import KMeans, MiniBatchKMeans
 import warnings
+import weakref
 warnings.filterwarnings('ignore')
 
 class RiskAssessmentAnalyzer:
     def __init__(self):
         self.severity_weights = {'Low': 1, 'Medium': 2, 'High': 3, 'Critical': 4}
+        self._dt_cache = (None, None)
+        self._critical_cache = (None, None)
+        self.cluster_feature_names = None
+        
+    def _created_at(self, df):
+        """Parse created_at once per frame and reuse it across analysis steps"""
+        frame_ref, created_at = self._dt_cache
+        if frame_ref is None or frame_ref() is not df:
+            created_at = pd.to_datetime(df['created_at'])
+            self._dt_cache = (weakref.ref(df), created_at)
+        return created_at
+    
+    def _critical_mask(self, df):
+        """Boolean mask of Critical reports, cached by calculate_risk_scores"""
+        frame_ref, is_critical = self._critical_cache
+        if frame_ref is None or frame_ref() is not df:
+            is_critical = df['severity'].to_numpy() == 'Critical'
+            self._critical_cache = (weakref.ref(df), is_critical)
+        return is_critical
         
     def calculate_risk_scores(self, df):
         """Calculate comprehensive risk scores"""
-        # Weighted risk score by severity
-        df['risk_score'] = df['severity'].map(self.severity_weights)
+        # Weighted risk score by severity: weights are 1..4 in category order,
+        # so the score is the category code plus one (NaN for missing/unknown severity)
+        severity = pd.Categorical(df['severity'], categories=list(self.severity_weights),
+                                  ordered=True)
+        df['severity'] = severity
+        df['risk_score'] = np.where(severity.codes >= 0, severity.codes + 1, np.nan).astype(np.float32)
+        
+        # Encode the categorical columns once; correlation and clustering reuse the codes
+        for col in ('ai_tool', 'risk_type'):
+            df[col] = df[col].astype('category')
+        for col in ('ai_tool', 'risk_type', 'severity'):
+            df[f'{col}_code'] = df[col].cat.codes.astype(np.int16)
         
-        # Tool-specific risk scores
-        tool_risk_scores = df.groupby('ai_tool').agg({
-            'risk_score': ['mean', 'sum', 'count'],
-            'severity': lambda x: (x == 'Critical').sum()
-        }).round(2)
+        # Tool-specific risk scores, using only built-in aggregations
+        # (summed in float64; count skips unscored rows)
+        is_critical = severity.codes == list(self.severity_weights).index('Critical')
+        self._critical_cache = (weakref.ref(df), is_critical)
+        tool_risk_scores = pd.DataFrame({
+            'ai_tool': df['ai_tool'],
+            'risk_score': df['risk_score'].astype(np.float64),
+            'is_critical': is_critical
+        }, index=df.index).groupby('ai_tool', observed=True).agg(
+            avg_risk_score=('risk_score', 'mean'),
+            total_risk_score=('risk_score', 'sum'),
+            report_count=('risk_score', 'count'),
+            critical_count=('is_critical', 'sum')
+        ).round(2)
         
-        tool_risk_scores.columns = ['avg_risk_score', 'total_risk_score', 'report_count', 'critical_count']
         tool_risk_scores['risk_density'] = (tool_risk_scores['total_risk_score'] / 
                                           tool_risk_scores['report_count']).round(2)
         
@@ -40,66 +73,118 @@ class RiskAssessmentAnalyzer:
     
     def trend_analysis(self, df):
         """Analyze trends in risk reporting"""
-        df['date'] = pd.to_datetime(df['created_at']).dt.date
-        df['week'] = pd.to_datetime(df['created_at']).dt.isocalendar().week
-        df['month'] = pd.to_datetime(df['created_at']).dt.month
+        created_at = self._created_at(df)
+        df['date'] = created_at.dt.date
+        # Nullable integers, so unparseable (NaT) timestamps stay missing
+        df['week'] = created_at.dt.isocalendar().week.astype('Int16')
+        df['month'] = created_at.dt.month.astype('Int8')
         
         # Daily trends
-        daily_trends = df.groupby(['date', 'severity']).size().unstack(fill_value=0)
+        daily_trends = df.groupby(['date', 'severity'], observed=True).size().unstack(fill_value=0)
         
-        # Weekly trends
-        weekly_trends = df.groupby(['week', 'risk_type']).size().unstack(fill_value=0)
+        # Weekly trends: one bincount pass over (week, risk type code) pairs
+        risk_type = df['risk_type'].astype('category')
+        risk_codes = risk_type.cat.codes.to_numpy()
+        categories = risk_type.cat.categories
+        week_values = df['week'].to_numpy(np.int32, na_value=-1)
+        present = (risk_codes >= 0) & (week_values >= 0)
+        weeks, week_idx = np.unique(week_values[present], return_inverse=True)
+        n_risks = len(categories)
+        week_counts = np.bincount(week_idx * n_risks + risk_codes[present],
+                                  minlength=len(weeks) * n_risks).reshape(len(weeks), n_risks)
+        observed = week_counts.sum(axis=0) > 0
+        weekly_trends = pd.DataFrame(week_counts[:, observed],
+                                     index=pd.Index(weeks, name='week'),
+                                     columns=pd.CategoricalIndex(categories[observed],
+                                                                 dtype=risk_type.dtype, name='risk_type'))
         
         # Calculate trend direction (increasing/decreasing)
         recent_week = df['week'].max()
+        if pd.isna(recent_week):
+            return daily_trends, weekly_trends, {}
         prev_week = recent_week - 1
         
-        trend_direction = {}
-        for risk_type in df['risk_type'].unique():
-            recent_count = len(df[(df['week'] == recent_week) & (df['risk_type'] == risk_type)])
-            prev_count = len(df[(df['week'] == prev_week) & (df['risk_type'] == risk_type)])
-            
-            if prev_count > 0:
-                change_pct = ((recent_count - prev_count) / prev_count) * 100
-                trend_direction[risk_type] = {
-                    'change_pct': round(change_pct, 1),
-                    'direction': 'increasing' if change_pct > 5 else 'decreasing' if change_pct < -5 else 'stable'
-                }
+        recent_counts = weekly_trends.reindex([recent_week], fill_value=0).iloc[0]
+        prev_counts = weekly_trends.reindex([prev_week], fill_value=0).iloc[0]
+        has_prev = (prev_counts > 0).to_numpy()
+        
+        prev = prev_counts.to_numpy()[has_prev]
+        change_pct = (recent_counts.to_numpy()[has_prev] - prev) / prev * 100
+        direction = np.select([change_pct > 5, change_pct < -5], ['increasing', 'decreasing'], 'stable')
+        
+        trends = {
+            risk_type: {'change_pct': round(float(change), 1), 'direction': str(label)}
+            for risk_type, change, label in zip(weekly_trends.columns[has_prev], change_pct, direction)
+        }
+        
+        # Report risk types in order of first appearance, as the data lists them
+        first_seen = categories[pd.unique(risk_codes[risk_codes >= 0])]
+        trend_direction = {risk_type: trends[risk_type] for risk_type in first_seen if risk_type in trends}
         
         return daily_trends, weekly_trends, trend_direction
     
     def severity_correlation_analysis(self, df):
         """Analyze correlations between different factors and severity"""
-        # Encode categorical variables
-        le_tool = LabelEncoder()
-        le_risk = LabelEncoder()
+        # The category codes from calculate_risk_scores are the encodings; the
+        # categories map them back to labels
+        tool_categories = df['ai_tool'].cat.categories
+        risk_categories = df['risk_type'].cat.categories
         
-        df_encoded = df.copy()
-        df_encoded['ai_tool_encoded'] = le_tool.fit_transform(df['ai_tool'])
-        df_encoded['risk_type_encoded'] = le_risk.fit_transform(df['risk_type'])
-        
-        # Correlation matrix
+        # Correlation matrix from one stacked float32 array; np.corrcoef is not
+        # NaN-aware, so unscored rows fall back to pandas' pairwise version
         correlation_features = ['ai_tool_encoded', 'risk_type_encoded', 'risk_score', 'report_requested']
-        correlation_matrix = df_encoded[correlation_features].select_dtypes(include=[np.number]).corr()
+        values = np.stack([
+            df['ai_tool_code'].to_numpy(np.float32),
+            df['risk_type_code'].to_numpy(np.float32),
+            df['risk_score'].to_numpy(np.float32),
+            df['report_requested'].to_numpy(np.float32)
+        ], axis=1)
+        if np.isnan(values).any():
+            correlation_matrix = pd.DataFrame(values, columns=correlation_features).corr()
+        else:
+            correlation_matrix = pd.DataFrame(np.corrcoef(values, rowvar=False),
+                                              index=correlation_features, columns=correlation_features)
         
-        return correlation_matrix, le_tool, le_risk
+        return correlation_matrix, tool_categories, risk_categories
     
     def risk_clustering(self, df):
         """Perform clustering analysis to identify risk patterns"""
-        # Prepare features for clustering
-        feature_df = pd.get_dummies(df[['ai_tool', 'risk_type', 'severity']])
+        # Prepare sparse one-hot features for clustering from the cached category codes
+        columns = ['ai_tool', 'risk_type', 'severity']
+        offsets = np.cumsum([0] + [len(df[col].cat.categories) for col in columns])
+        codes = df[[f'{col}_code' for col in columns]].to_numpy(np.int64)
+        rows = np.broadcast_to(np.arange(len(df))[:, None], codes.shape)
+        present = codes >= 0
+        features = sparse.csr_matrix(
+            (np.ones(present.sum(), dtype=np.float32), (rows[present], (codes + offsets[:-1])[present])),
+            shape=(len(df), offsets[-1])
+        )
+        self.cluster_feature_names = [f'{col}_{category}' for col in columns
+                                      for category in df[col].cat.categories]
         
-        # Perform K-means clustering
-        kmeans = KMeans(n_clusters=4, random_state=42)
-        df['cluster'] = kmeans.fit_predict(feature_df)
+        # Perform K-means clustering on the sparse matrix; mini-batches only pay off
+        # once the dataset is large
+        if len(df) < 10_000:
+            kmeans = KMeans(n_clusters=4, n_init=1, random_state=42)
+        else:
+            kmeans = MiniBatchKMeans(n_clusters=4, batch_size=min(4096, len(df)),
+                                     n_init=3, max_iter=100, random_state=42)
+        df['cluster'] = kmeans.fit_predict(features)
         
-        # Analyze clusters
-        cluster_analysis = df.groupby('cluster').agg({
-            'ai_tool': lambda x: x.mode().iloc[0],
-            'risk_type': lambda x: x.mode().iloc[0],
-            'severity': lambda x: x.mode().iloc[0],
-            'risk_score': 'mean'
-        }).round(2)
+        # Analyze clusters: most common category per cluster from a code-count table
+        # (argmax keeps the first category on ties, like mode())
+        clusters = df['cluster'].to_numpy()
+        cluster_ids = np.unique(clusters)
+        cluster_analysis = pd.DataFrame(index=pd.Index(cluster_ids, name='cluster'))
+        for col in columns:
+            categories = df[col].cat.categories
+            col_codes = df[f'{col}_code'].to_numpy()
+            present = col_codes >= 0
+            counts = np.bincount(clusters[present] * len(categories) + col_codes[present],
+                                 minlength=kmeans.n_clusters * len(categories))
+            top = counts.reshape(kmeans.n_clusters, len(categories))[cluster_ids].argmax(axis=1)
+            cluster_analysis[col] = categories[top]
+        cluster_analysis['risk_score'] = df.groupby('cluster', observed=True)['risk_score'].mean().round(2)
         
         cluster_analysis['cluster_size'] = df['cluster'].value_counts().sort_index()
         
@@ -109,7 +194,7 @@ class RiskAssessmentAnalyzer:
         """Generate actionable insights from the analysis"""
         insights = []
         
-        # High-risk tools
+        # High-risk tools (highest first when tool_scores is passed ranked)
         high_risk_tools = tool_scores[tool_scores['avg_risk_score'] >= 3].index.tolist()
         if high_risk_tools:
             insights.append({
@@ -120,7 +205,7 @@ class RiskAssessmentAnalyzer:
             })
         
         # Critical severity analysis  
-        critical_pct = (df['severity'] == 'Critical').mean() * 100
+        critical_pct = self._critical_mask(df).mean() * 100
         if critical_pct > 10:
             insights.append({
                 'type': 'Critical Risk Alert',
@@ -140,7 +225,7 @@ class RiskAssessmentAnalyzer:
                 })
         
         # Email engagement
-        email_rate = df['report_requested'].mean() * 100
+        email_rate = df['report_requested'].to_numpy().mean() * 100
         if email_rate < 30:
             insights.append({
                 'type': 'Low Engagement',
@@ -153,14 +238,19 @@ class RiskAssessmentAnalyzer:
     
     def create_advanced_visualizations(self, df, tool_scores):
         """Create advanced visualizations using Plotly"""
+        import plotly.express as px
+        
+        # One tool/risk/severity summary feeds both the heatmap and the sunburst
+        hierarchy = df.groupby(['ai_tool', 'risk_type', 'severity'], observed=True)['risk_score'].agg(['sum', 'count'])
         
         # 1. Risk Heatmap
-        risk_matrix = df.pivot_table(values='risk_score', 
-                                   index='ai_tool', 
-                                   columns='risk_type', 
-                                   aggfunc='mean')
+        tool_risk = hierarchy.groupby(level=['ai_tool', 'risk_type'], observed=True).sum()
+        risk_matrix = (tool_risk['sum'] / tool_risk['count']).unstack()
         
-        fig_heatmap = px.imshow(risk_matrix, 
+        fig_heatmap = px.imshow(risk_matrix.to_numpy(),
+                               x=risk_matrix.columns.astype(str).tolist(),
+                               y=risk_matrix.index.astype(str).tolist(),
+                               labels={'x': 'risk_type', 'y': 'ai_tool'},
                                title='AI Tool vs Risk Type Heatmap (Average Risk Score)',
                                color_continuous_scale='Reds')
         
@@ -177,8 +267,10 @@ class RiskAssessmentAnalyzer:
                                       'avg_risk_score': 'Average Risk Score'})
         
         # 3. Time Series Analysis
-        df['date'] = pd.to_datetime(df['created_at']).dt.date
-        time_series = df.groupby(['date', 'severity']).size().reset_index(name='count')
+        # trend_analysis normally adds the date column already
+        if 'date' not in df.columns:
+            df['date'] = self._created_at(df).dt.date
+        time_series = df.groupby(['date', 'severity'], observed=True).size().reset_index(name='count')
         fig_timeline = px.line(time_series, 
                               x='date', 
                               y='count', 
@@ -186,38 +278,46 @@ class RiskAssessmentAnalyzer:
                               title='Risk Reports Timeline by Severity')
         
         # 4. Risk Distribution Sunburst
-        fig_sunburst = px.sunburst(df, 
+        fig_sunburst = px.sunburst(hierarchy['count'].reset_index(),
                                   path=['ai_tool', 'risk_type', 'severity'],
+                                  values='count',
                                   title='Risk Assessment Hierarchy')
         
         return fig_heatmap, fig_bubble, fig_timeline, fig_sunburst
     
     def export_analysis_report(self, df, insights, tool_scores):
         """Export comprehensive analysis report"""
-        with open('risk_analysis_report.txt', 'w') as f:
-            f.write("=== AI RISK ASSESSMENT ANALYSIS REPORT ===\n\n")
-            
+        # Skip the sort when the caller already passed the scores ranked
+        if not tool_scores['avg_risk_score'].is_monotonic_decreasing:
+            tool_scores = tool_scores.sort_values('avg_risk_score', ascending=False)
+        top_tools = tool_scores.head(5)
+        
+        lines = [
+            "=== AI RISK ASSESSMENT ANALYSIS REPORT ===",
+            "",
             # Summary Statistics
-            f.write("SUMMARY STATISTICS:\n")
-            f.write(f"Total Reports: {len(df)}\n")
-            f.write(f"Unique AI Tools: {df['ai_tool'].nunique()}\n")
-            f.write(f"Unique Risk Types: {df['risk_type'].nunique()}\n")
-            f.write(f"Average Risk Score: {df['risk_score'].mean():.2f}\n")
-            f.write(f"Critical Reports: {(df['severity'] == 'Critical').sum()}\n\n")
-            
+            "SUMMARY STATISTICS:",
+            f"Total Reports: {len(df)}",
+            f"Unique AI Tools: {df['ai_tool'].nunique()}",
+            f"Unique Risk Types: {df['risk_type'].nunique()}",
+            f"Average Risk Score: {df['risk_score'].mean():.2f}",
+            f"Critical Reports: {self._critical_mask(df).sum()}",
+            "",
             # Top Risk Tools
-            f.write("TOP RISK TOOLS:\n")
-            top_tools = tool_scores.sort_values('avg_risk_score', ascending=False).head(5)
-            for tool, data in top_tools.iterrows():
-                f.write(f"- {tool}: Avg Risk {data['avg_risk_score']}, "
-                       f"Reports {data['report_count']}, Critical {data['critical_count']}\n")
-            f.write("\n")
-            
+            "TOP RISK TOOLS:",
+            *(f"- {tool}: Avg Risk {avg_risk}, Reports {reports}, Critical {critical}"
+              for tool, avg_risk, reports, critical in top_tools[
+                  ['avg_risk_score', 'report_count', 'critical_count']].itertuples(name=None)),
+            "",
             # Key Insights
-            f.write("KEY INSIGHTS:\n")
-            for insight in insights:
-                f.write(f"[{insight['priority']}] {insight['type']}: {insight['message']}\n")
-                f.write(f"   Recommendation: {insight['recommendation']}\n\n")
+            "KEY INSIGHTS:",
+            *(f"[{insight['priority']}] {insight['type']}: {insight['message']}\n"
+              f"   Recommendation: {insight['recommendation']}\n"
+              for insight in insights)
+        ]
+        
+        with open('risk_analysis_report.txt', 'w', buffering=1 << 16) as f:
+            f.write('\n'.join(lines) + '\n')
         
         print("Analysis report exported to 'risk_analysis_report.txt'")
 
@@ -225,16 +325,33 @@ def run_comprehensive_analysis():
     """Main function to run comprehensive risk analysis"""
     print("=== AI Risk Assessment Comprehensive Analysis ===\n")
     
-    # Load data (assuming cleaned data exists)
-    try:
-        df = pd.read_csv('cleaned_risk_assessments.csv')
-        df['created_at'] = pd.to_datetime(df['created_at'])
-    except FileNotFoundError:
+    # Load data (assuming cleaned data exists) from whichever of the Parquet and CSV
+    # copies is newer, reading only the columns the analysis uses
+    columns = ['ai_tool', 'risk_type', 'severity', 'created_at', 'report_requested']
+    parquet_path, csv_path = 'cleaned_risk_assessments.parquet', 'cleaned_risk_assessments.csv'
+    sources = [path for path in (parquet_path, csv_path) if os.path.exists(path)]
+    source = max(sources, key=os.path.getmtime) if sources else None
+    
+    if source == parquet_path:
+        import pyarrow.parquet as pq
+        df = pq.read_table(parquet_path, columns=columns).to_pandas()
+    elif source == csv_path:
+        df = pd.read_csv(csv_path, engine='pyarrow',
+                         usecols=columns, parse_dates=['created_at'],
+                         dtype={'ai_tool': 'category', 'risk_type': 'category',
+                                'severity': 'category', 'report_requested': 'bool'})
+    else:
         print("Creating sample data for analysis...")
         from data_cleaning import RiskAssessmentDataCleaner
         cleaner = RiskAssessmentDataCleaner()
         df = cleaner.load_sample_data()
         df = cleaner.clean_dataset(df)
+    if source is not None:
+        print(f"Loaded {len(df)} records from '{source}'")
+    
+    # Work on categorical label columns from here on, whichever source was used
+    for col in ('ai_tool', 'risk_type', 'severity'):
+        df[col] = df[col].astype('category')
     
     # Initialize analyzer
     analyzer = RiskAssessmentAnalyzer()
@@ -242,23 +359,24 @@ def run_comprehensive_analysis():
     # Perform analyses
     print("Calculating risk scores...")
     df, tool_scores = analyzer.calculate_risk_scores(df)
+    sorted_tools = tool_scores.sort_values('avg_risk_score', ascending=False)
     
     print("Analyzing trends...")
     daily_trends, weekly_trends, trend_direction = analyzer.trend_analysis(df)
     
     print("Performing correlation analysis...")
-    correlation_matrix, le_tool, le_risk = analyzer.severity_correlation_analysis(df)
+    correlation_matrix, tool_categories, risk_categories = analyzer.severity_correlation_analysis(df)
     
     print("Running clustering analysis...")
     df, cluster_analysis, kmeans = analyzer.risk_clustering(df)
     
     print("Generating insights...")
-    insights = analyzer.generate_risk_insights(df, tool_scores, trend_direction)
+    insights = analyzer.generate_risk_insights(df, sorted_tools, trend_direction)
     
     # Print results
     print("\n=== ANALYSIS RESULTS ===")
     print("\nTop Risk Tools:")
-    print(tool_scores.sort_values('avg_risk_score', ascending=False).head())
+    print(sorted_tools.head())
     
     print("\nTrend Analysis:")
     for risk_type, trend in trend_direction.items():
@@ -276,7 +394,7 @@ def run_comprehensive_analysis():
     fig_heatmap, fig_bubble, fig_timeline, fig_sunburst = analyzer.create_advanced_visualizations(df, tool_scores)
     
     # Export report
-    analyzer.export_analysis_report(df, insights, tool_scores)
+    analyzer.export_analysis_report(df, insights, sorted_tools)
     
     return df, tool_scores, insights
 